@@ -99,6 +99,10 @@ class LogConfig:
     backup_count: int = 5
 
 
+# 支持从配置文件和update_config更新的配置项
+_CONFIG_SECTIONS = ('spider', 'database', 'strategy')
+
+
 class ConfigManager:
     """配置管理器"""
     def __init__(self, config_file: str = "app_config.json"):
@@ -117,27 +121,20 @@ class ConfigManager:
                 with open(self.config_file, 'r', encoding='utf-8') as f:
                     config_data = json.load(f)
                 
-                # 更新爬虫配置
-                if 'spider' in config_data:
-                    for key, value in config_data['spider'].items():
-                        if hasattr(self.spider, key):
-                            setattr(self.spider, key, value)
-                
-                # 更新数据库配置
-                if 'database' in config_data:
-                    for key, value in config_data['database'].items():
-                        if hasattr(self.database, key):
-                            setattr(self.database, key, value)
-                
-                # 更新策略配置
-                if 'strategy' in config_data:
-                    for key, value in config_data['strategy'].items():
-                        if hasattr(self.strategy, key):
-                            setattr(self.strategy, key, value)
+                self.apply_config(config_data)
                 
             except Exception as e:
                 print(f"加载配置文件失败: {e}")
     
+    def apply_config(self, config_data: Dict[str, Any]) -> None:
+        """将配置字典中已知的字段更新到对应配置对象"""
+        for section in _CONFIG_SECTIONS:
+            if section in config_data:
+                section_config = getattr(self, section)
+                for key, value in config_data[section].items():
+                    if hasattr(section_config, key):
+                        setattr(section_config, key, value)
+    
     def _setup_logging(self):
         """设置日志系统"""
         # 创建日志目录
@@ -197,21 +194,7 @@ def get_config() -> ConfigManager:
 
 def update_config(config_dict: Dict[str, Any]) -> None:
     """更新配置"""
-    # 更新爬虫配置
-    if 'spider' in config_dict:
-        for key, value in config_dict['spider'].items():
-            if hasattr(config_manager.spider, key):
-                setattr(config_manager.spider, key, value)
-    # 更新数据库配置
-    if 'database' in config_dict:
-        for key, value in config_dict['database'].items():
-            if hasattr(config_manager.database, key):
-                setattr(config_manager.database, key, value)
-    # 更新策略配置
-    if 'strategy' in config_dict:
-        for key, value in config_dict['strategy'].items():
-            if hasattr(config_manager.strategy, key):
-                setattr(config_manager.strategy, key, value)
+    config_manager.apply_config(config_dict)
     # 保存配置
     config_manager.save_config()
 
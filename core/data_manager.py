@@ -8,7 +8,8 @@ import os
 import sqlite3
 from typing import List, Dict, Any, Optional
 import logging
-from datetime import datetime
+from datetime import datetime, timedelta
+from operator import itemgetter
 
 from .config import get_config
 
@@ -18,6 +19,62 @@ def get_database_config():
 # 获取日志记录器
 logger = logging.getLogger(__name__)
 
+# 各表插入字段及默认值，键的顺序与对应INSERT语句的列顺序一致
+_STOCK_BASIC_DEFAULTS = {
+    'stock_code': '',
+    'stock_name': '',
+    'industry': '',
+    'sector': '',
+    'listing_date': '',
+    'total_share': 0.0,
+    '流通_share': 0.0,
+    'market_cap': 0.0,
+}
+
+_HOT_STOCK_DEFAULTS = {
+    'stock_code': '',
+    'stock_name': '',
+    'date': '',  # 插入时替换为当天日期
+    'price': 0.0,
+    'change_percent': 0.0,
+    'change_amount': 0.0,
+    'volume': 0,
+    'turnover': 0.0,
+    'market_cap': 0.0,
+    'pe': 0.0,
+    'pb': 0.0,
+    'rank': 0,
+    'hot_degree': 0,
+    'sector': '',
+    'industry': '',
+}
+
+_TRADER_DATA_DEFAULTS = {
+    'trader_name': '',
+    'date': '',  # 插入时替换为当天日期
+    'stock_code': '',
+    'stock_name': '',
+    'action': '',
+    'price': 0.0,
+    'volume': 0,
+    'amount': 0.0,
+    'position': 0.0,
+    'profit_percent': 0.0,
+    'reason': '',
+    'market_environment': '',
+    'sector': '',
+}
+
+# 按插入列顺序从记录中一次性取出参数元组
+_STOCK_BASIC_VALUES = itemgetter(*_STOCK_BASIC_DEFAULTS)
+_HOT_STOCK_VALUES = itemgetter(*_HOT_STOCK_DEFAULTS)
+_TRADER_DATA_VALUES = itemgetter(*_TRADER_DATA_DEFAULTS)
+
+
+def _dict_factory(cursor: sqlite3.Cursor, row: tuple) -> Dict[str, Any]:
+    """行工厂：查询结果直接生成字典，省去sqlite3.Row再转dict的一次拷贝"""
+    return dict(zip([column[0] for column in cursor.description], row))
+
 
 class DataManager:
     """数据管理器类"""
@@ -26,6 +83,8 @@ class DataManager:
         """初始化数据管理器"""
         self.db_config = get_database_config()
         self.db_path = self.db_config.db_path
+        # 复用的数据库连接，首次使用时建立
+        self._conn: Optional[sqlite3.Connection] = None
         self._ensure_database_exists()
         self._create_tables()
     
@@ -45,7 +104,7 @@ class DataManager:
     
     def _create_tables(self) -> None:
         """创建数据库表"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connect()
         cursor = conn.cursor()
         
         try:
@@ -89,6 +148,12 @@ class DataManager:
                 )
             """)
             
+            # 热门股按日期查询并按排名排序，建立索引避免全表扫描和临时排序
+            cursor.execute(f"""
+                CREATE INDEX IF NOT EXISTS idx_{self.db_config.hot_stocks_table}_date_rank
+                ON {self.db_config.hot_stocks_table} (date, rank)
+            """)
+            
             # 创建实盘选手数据表
             cursor.execute(f"""
                 CREATE TABLE IF NOT EXISTS {self.db_config.trader_data_table} (
@@ -112,6 +177,16 @@ class DataManager:
                 )
             """)
             
+            # 唯一约束已覆盖按选手查询；为不带选手的按日期、按股票查询及按日期清理旧数据补充索引
+            cursor.execute(f"""
+                CREATE INDEX IF NOT EXISTS idx_{self.db_config.trader_data_table}_date
+                ON {self.db_config.trader_data_table} (date)
+            """)
+            cursor.execute(f"""
+                CREATE INDEX IF NOT EXISTS idx_{self.db_config.trader_data_table}_stock_code
+                ON {self.db_config.trader_data_table} (stock_code, date)
+            """)
+            
             conn.commit()
             logger.info("数据库表创建完成")
             
@@ -121,11 +196,19 @@ class DataManager:
             raise
         finally:
             cursor.close()
-            conn.close()
     
     def _connect(self) -> sqlite3.Connection:
-        """建立数据库连接"""
-        return sqlite3.connect(self.db_path)
+        """获取数据库连接，首次调用时建立，之后各方法复用同一连接"""
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.db_path)
+            self._conn.row_factory = _dict_factory  # 查询结果直接为字典
+        return self._conn
+    
+    def close(self) -> None:
+        """关闭数据库连接"""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
     
     def insert_stock_basic(self, stock_data: List[Dict[str, Any]]) -> int:
         """插入股票基本信息
@@ -143,35 +226,20 @@ class DataManager:
         cursor = conn.cursor()
         
         try:
-            inserted = 0
-            for stock in stock_data:
-                # 确保所有必要字段存在
-                stock.setdefault('stock_code', '')
-                stock.setdefault('stock_name', '')
-                stock.setdefault('industry', '')
-                stock.setdefault('sector', '')
-                stock.setdefault('listing_date', '')
-                stock.setdefault('total_share', 0.0)
-                stock.setdefault('流通_share', 0.0)
-                stock.setdefault('market_cap', 0.0)
-                
-                # 使用REPLACE INTO处理重复数据
-                cursor.execute(f"""
-                    REPLACE INTO {self.db_config.stock_basic_table} 
-                    (stock_code, stock_name, industry, sector, listing_date, total_share, 流通_share, market_cap, updated_at)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    stock['stock_code'],
-                    stock['stock_name'],
-                    stock['industry'],
-                    stock['sector'],
-                    stock['listing_date'],
-                    stock['total_share'],
-                    stock['流通_share'],
-                    stock['market_cap'],
-                    datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                ))
-                inserted += 1
+            # 合并默认值补全缺失字段，按插入列顺序取值
+            updated_at = (datetime.now().strftime('%Y-%m-%d %H:%M:%S'),)
+            rows = [
+                _STOCK_BASIC_VALUES({**_STOCK_BASIC_DEFAULTS, **stock}) + updated_at
+                for stock in stock_data
+            ]
+            
+            # 使用REPLACE INTO处理重复数据，整批一次写入
+            cursor.executemany(f"""
+                REPLACE INTO {self.db_config.stock_basic_table} 
+                (stock_code, stock_name, industry, sector, listing_date, total_share, 流通_share, market_cap, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, rows)
+            inserted = len(rows)
             
             conn.commit()
             logger.info(f"插入了 {inserted} 条股票基本信息")
@@ -183,7 +251,6 @@ class DataManager:
             raise
         finally:
             cursor.close()
-            conn.close()
     
     def insert_hot_stocks(self, hot_stocks: List[Dict[str, Any]]) -> int:
         """插入热门股数据
@@ -201,49 +268,19 @@ class DataManager:
         cursor = conn.cursor()
         
         try:
-            inserted = 0
-            for stock in hot_stocks:
-                # 确保所有必要字段存在
-                stock.setdefault('stock_code', '')
-                stock.setdefault('stock_name', '')
-                stock.setdefault('date', datetime.now().strftime('%Y-%m-%d'))
-                stock.setdefault('price', 0.0)
-                stock.setdefault('change_percent', 0.0)
-                stock.setdefault('change_amount', 0.0)
-                stock.setdefault('volume', 0)
-                stock.setdefault('turnover', 0.0)
-                stock.setdefault('market_cap', 0.0)
-                stock.setdefault('pe', 0.0)
-                stock.setdefault('pb', 0.0)
-                stock.setdefault('rank', 0)
-                stock.setdefault('hot_degree', 0)
-                stock.setdefault('sector', '')
-                stock.setdefault('industry', '')
-                
-                # 使用INSERT OR IGNORE处理重复数据
-                cursor.execute(f"""
-                    INSERT OR IGNORE INTO {self.db_config.hot_stocks_table} 
-                    (stock_code, stock_name, date, price, change_percent, change_amount, 
-                     volume, turnover, market_cap, pe, pb, rank, hot_degree, sector, industry)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    stock['stock_code'],
-                    stock['stock_name'],
-                    stock['date'],
-                    stock['price'],
-                    stock['change_percent'],
-                    stock['change_amount'],
-                    stock['volume'],
-                    stock['turnover'],
-                    stock['market_cap'],
-                    stock['pe'],
-                    stock['pb'],
-                    stock['rank'],
-                    stock['hot_degree'],
-                    stock['sector'],
-                    stock['industry']
-                ))
-                inserted += cursor.rowcount
+            # 合并默认值补全缺失字段，按插入列顺序取值
+            defaults = {**_HOT_STOCK_DEFAULTS, 'date': datetime.now().strftime('%Y-%m-%d')}
+            rows = [_HOT_STOCK_VALUES({**defaults, **stock}) for stock in hot_stocks]
+            
+            # 使用INSERT OR IGNORE处理重复数据，整批一次写入
+            cursor.executemany(f"""
+                INSERT OR IGNORE INTO {self.db_config.hot_stocks_table} 
+                (stock_code, stock_name, date, price, change_percent, change_amount, 
+                 volume, turnover, market_cap, pe, pb, rank, hot_degree, sector, industry)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, rows)
+            # executemany的rowcount为整批实际插入的记录数之和
+            inserted = cursor.rowcount
             
             conn.commit()
             logger.info(f"插入了 {inserted} 条热门股数据")
@@ -255,7 +292,6 @@ class DataManager:
             raise
         finally:
             cursor.close()
-            conn.close()
     
     def insert_trader_data(self, trader_data: List[Dict[str, Any]]) -> int:
         """插入实盘选手交易数据
@@ -273,45 +309,18 @@ class DataManager:
         cursor = conn.cursor()
         
         try:
-            inserted = 0
-            for data in trader_data:
-                # 确保所有必要字段存在
-                data.setdefault('trader_name', '')
-                data.setdefault('date', datetime.now().strftime('%Y-%m-%d'))
-                data.setdefault('stock_code', '')
-                data.setdefault('stock_name', '')
-                data.setdefault('action', '')
-                data.setdefault('price', 0.0)
-                data.setdefault('volume', 0)
-                data.setdefault('amount', 0.0)
-                data.setdefault('position', 0.0)
-                data.setdefault('profit_percent', 0.0)
-                data.setdefault('reason', '')
-                data.setdefault('market_environment', '')
-                data.setdefault('sector', '')
-                
-                # 使用INSERT OR IGNORE处理重复数据
-                cursor.execute(f"""
-                    INSERT OR IGNORE INTO {self.db_config.trader_data_table} 
-                    (trader_name, date, stock_code, stock_name, action, price, volume, 
-                     amount, position, profit_percent, reason, market_environment, sector)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    data['trader_name'],
-                    data['date'],
-                    data['stock_code'],
-                    data['stock_name'],
-                    data['action'],
-                    data['price'],
-                    data['volume'],
-                    data['amount'],
-                    data['position'],
-                    data['profit_percent'],
-                    data['reason'],
-                    data['market_environment'],
-                    data['sector']
-                ))
-                inserted += cursor.rowcount
+            # 合并默认值补全缺失字段，按插入列顺序取值
+            defaults = {**_TRADER_DATA_DEFAULTS, 'date': datetime.now().strftime('%Y-%m-%d')}
+            rows = [_TRADER_DATA_VALUES({**defaults, **data}) for data in trader_data]
+            
+            # 使用INSERT OR IGNORE处理重复数据，整批一次写入
+            cursor.executemany(f"""
+                INSERT OR IGNORE INTO {self.db_config.trader_data_table} 
+                (trader_name, date, stock_code, stock_name, action, price, volume, 
+                 amount, position, profit_percent, reason, market_environment, sector)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, rows)
+            inserted = cursor.rowcount
             
             conn.commit()
             logger.info(f"插入了 {inserted} 条实盘选手交易数据")
@@ -323,7 +332,6 @@ class DataManager:
             raise
         finally:
             cursor.close()
-            conn.close()
     
     def get_hot_stocks(self, date: str = None, limit: int = 100) -> List[Dict[str, Any]]:
         """获取热门股数据
@@ -336,41 +344,18 @@ class DataManager:
             List[Dict[str, Any]]: 热门股数据列表
         """
         conn = self._connect()
-        conn.row_factory = sqlite3.Row  # 使结果可以通过列名访问
         cursor = conn.cursor()
         
         try:
-            if date:
-                # 获取指定日期的热门股
-                cursor.execute(f"""
-                    SELECT * FROM {self.db_config.hot_stocks_table} 
-                    WHERE date = ? 
-                    ORDER BY rank LIMIT ?
-                """, (date, limit))
-            else:
-                # 获取最新日期的热门股
-                # 首先获取最新的日期
-                cursor.execute(f"""
-                    SELECT MAX(date) as latest_date FROM {self.db_config.hot_stocks_table}
-                """)
-                latest_date = cursor.fetchone()['latest_date']
-                
-                if latest_date:
-                    # 获取最新日期的热门股，按rank排序
-                    cursor.execute(f"""
-                        SELECT * FROM {self.db_config.hot_stocks_table} 
-                        WHERE date = ? 
-                        ORDER BY rank LIMIT ?
-                    """, (latest_date, limit))
-                else:
-                    # 如果没有数据，返回空列表
-                    cursor.execute(f"""
-                        SELECT * FROM {self.db_config.hot_stocks_table} 
-                        ORDER BY rank LIMIT ?
-                    """, (limit,))
-            
-            rows = cursor.fetchall()
-            result = [dict(row) for row in rows]
+            # 未指定日期（None或空字符串）时用子查询取最新日期，一次查询完成，不再先单独查MAX(date)
+            cursor.execute(f"""
+                SELECT * FROM {self.db_config.hot_stocks_table} 
+                WHERE date = COALESCE(?, (SELECT MAX(date) FROM {self.db_config.hot_stocks_table})) 
+                ORDER BY rank LIMIT ?
+            """, (date or None, limit))
+            
+            # 行工厂已直接生成字典，直接迭代游标收集结果
+            result = list(cursor)
             logger.info(f"获取了 {len(result)} 条热门股数据")
             return result
             
@@ -379,7 +364,6 @@ class DataManager:
             raise
         finally:
             cursor.close()
-            conn.close()
     
     def get_trader_data(self, trader_name: str = None, date: str = None, 
                        stock_code: str = None, action: str = None) -> List[Dict[str, Any]]:
@@ -395,7 +379,6 @@ class DataManager:
             List[Dict[str, Any]]: 实盘选手交易数据列表
         """
         conn = self._connect()
-        conn.row_factory = sqlite3.Row
         cursor = conn.cursor()
         
         try:
@@ -425,8 +408,8 @@ class DataManager:
                 ORDER BY date DESC, id DESC
             """, params)
             
-            rows = cursor.fetchall()
-            result = [dict(row) for row in rows]
+            # 行工厂已直接生成字典，直接迭代游标收集结果
+            result = list(cursor)
             logger.info(f"获取了 {len(result)} 条实盘选手交易数据")
             return result
             
@@ -435,7 +418,6 @@ class DataManager:
             raise
         finally:
             cursor.close()
-            conn.close()
     
     def get_stock_basic(self, stock_code: str = None) -> List[Dict[str, Any]]:
         """获取股票基本信息
@@ -447,7 +429,6 @@ class DataManager:
             List[Dict[str, Any]]: 股票基本信息列表
         """
         conn = self._connect()
-        conn.row_factory = sqlite3.Row
         cursor = conn.cursor()
         
         try:
@@ -461,8 +442,8 @@ class DataManager:
                     SELECT * FROM {self.db_config.stock_basic_table}
                 """)
             
-            rows = cursor.fetchall()
-            result = [dict(row) for row in rows]
+            # 行工厂已直接生成字典，直接迭代游标收集结果
+            result = list(cursor)
             logger.info(f"获取了 {len(result)} 条股票基本信息")
             return result
             
@@ -471,7 +452,6 @@ class DataManager:
             raise
         finally:
             cursor.close()
-            conn.close()
     
     def delete_old_data(self, table_name: str, days: int = 30) -> int:
         """删除指定天数前的旧数据
@@ -487,11 +467,8 @@ class DataManager:
         cursor = conn.cursor()
         
         try:
-            # 计算截止日期
-            cutoff_date = datetime.now().strftime('%Y-%m-%d')
-            # SQLite不支持DATE_SUB，所以我们使用Python计算
-            import datetime as dt
-            cutoff_date = (dt.datetime.now() - dt.timedelta(days=days)).strftime('%Y-%m-%d')
+            # 计算截止日期，SQLite不支持DATE_SUB，所以我们使用Python计算
+            cutoff_date = (datetime.now() - timedelta(days=days)).strftime('%Y-%m-%d')
             
             cursor.execute(f"""
                 DELETE FROM {table_name} WHERE date < ?
@@ -508,11 +485,13 @@ class DataManager:
             raise
         finally:
             cursor.close()
-            conn.close()
     
     def execute_query(self, query: str, params: tuple = None) -> List[Dict[str, Any]]:
         """执行自定义SQL查询
         
+        自定义查询只用于读取，语句中的修改不会提交，执行后统一回滚，
+        避免在共享连接上留下未结束的事务
+        
         Args:
             query: SQL查询语句
             params: 查询参数
@@ -521,7 +500,6 @@ class DataManager:
             List[Dict[str, Any]]: 查询结果
         """
         conn = self._connect()
-        conn.row_factory = sqlite3.Row
         cursor = conn.cursor()
         
         try:
@@ -530,8 +508,8 @@ class DataManager:
             else:
                 cursor.execute(query)
             
-            rows = cursor.fetchall()
-            result = [dict(row) for row in rows]
+            # 行工厂已直接生成字典，直接迭代游标收集结果
+            result = list(cursor)
             logger.info(f"执行自定义查询，获取了 {len(result)} 条数据")
             return result
             
@@ -540,55 +518,65 @@ class DataManager:
             raise
         finally:
             cursor.close()
-            conn.close()
+            if conn.in_transaction:
+                conn.rollback()
 
 
-# 全局数据管理器实例
-data_manager = DataManager()
+# 全局数据管理器实例，首次使用时才创建，导入模块时不再建库建表
+_data_manager: Optional[DataManager] = None
 
 
 # 便捷访问函数
 def get_data_manager() -> DataManager:
     """获取数据管理器实例"""
-    return data_manager
+    global _data_manager
+    if _data_manager is None:
+        _data_manager = DataManager()
+    return _data_manager
+
+
+def close_data_manager() -> None:
+    """关闭数据管理器的数据库连接，未创建过实例时不做任何操作"""
+    if _data_manager is not None:
+        _data_manager.close()
 
 
 def insert_stock_basic_data(stock_data: List[Dict[str, Any]]) -> int:
     """插入股票基本信息"""
-    return data_manager.insert_stock_basic(stock_data)
+    return get_data_manager().insert_stock_basic(stock_data)
 
 
 def insert_hot_stocks_data(hot_stocks: List[Dict[str, Any]]) -> int:
     """插入热门股数据"""
-    return data_manager.insert_hot_stocks(hot_stocks)
+    return get_data_manager().insert_hot_stocks(hot_stocks)
 
 
 def insert_trader_data_data(trader_data: List[Dict[str, Any]]) -> int:
     """插入实盘选手交易数据"""
-    return data_manager.insert_trader_data(trader_data)
+    return get_data_manager().insert_trader_data(trader_data)
 
 
 def get_hot_stocks_data(date: str = None, limit: int = 100) -> List[Dict[str, Any]]:
     """获取热门股数据"""
-    return data_manager.get_hot_stocks(date, limit)
+    return get_data_manager().get_hot_stocks(date, limit)
 
 
 def get_trader_data_data(trader_name: str = None, date: str = None, 
                        stock_code: str = None, action: str = None) -> List[Dict[str, Any]]:
     """获取实盘选手交易数据"""
-    return data_manager.get_trader_data(trader_name, date, stock_code, action)
+    return get_data_manager().get_trader_data(trader_name, date, stock_code, action)
 
 
 def get_stock_basic_data(stock_code: str = None) -> List[Dict[str, Any]]:
     """获取股票基本信息"""
-    return data_manager.get_stock_basic(stock_code)
+    return get_data_manager().get_stock_basic(stock_code)
 
 
 def delete_old_stock_data(table_name: str, days: int = 30) -> int:
     """删除旧数据"""
-    return data_manager.delete_old_data(table_name, days)
+    return get_data_manager().delete_old_data(table_name, days)
 
 
 def execute_custom_query(query: str, params: tuple = None) -> List[Dict[str, Any]]:
     """执行自定义查询"""
-    return data_manager.execute_query(query, params)
+    return get_data_manager().execute_query(query, params)
@@ -1,8 +1,11 @@
-import sys
-sys.path.insert(0, '.')
+import re
 from core.spider import get_stock_spider
 from bs4 import BeautifulSoup
 
+# 预编译匹配模式，交给BeautifulSoup直接用正则搜索，不再对每个节点调用lambda
+HOT_TEXT_PATTERN = re.compile(r'热门|排行榜|rank', re.IGNORECASE)
+HOT_ATTR_PATTERN = re.compile(r'hot', re.IGNORECASE)
+
 spider = get_stock_spider()
 
 # 访问同花顺数据中心
@@ -31,13 +34,13 @@ for i, table in enumerate(tables):
 
 # 查找所有包含"热门"或"rank"的元素
 print("\n包含'热门'或'排行榜'的元素:")
-hot_elements = soup.find_all(text=lambda text: text and ('热门' in text or '排行榜' in text or 'rank' in text.lower()))
+hot_elements = soup.find_all(text=HOT_TEXT_PATTERN)
 for elem in hot_elements[:10]:
     print(elem.strip())
 
 # 查找所有带有class或id包含hot的元素
 print("\n带有hot相关class或id的元素:")
-hot_class_elements = soup.find_all(class_=lambda cls: cls and 'hot' in cls.lower())
-hot_id_elements = soup.find_all(id=lambda id: id and 'hot' in id.lower())
+hot_class_elements = soup.find_all(class_=HOT_ATTR_PATTERN)
+hot_id_elements = soup.find_all(id=HOT_ATTR_PATTERN)
 for elem in hot_class_elements[:5] + hot_id_elements[:5]:
     print(f"元素: {elem.name}, class: {elem.get('class')}, id: {elem.get('id')}, 文本: {elem.text.strip()[:100]}")
@@ -4,16 +4,12 @@ A股短线选股应用主程序
 用于启动数据获取、选股策略执行等功能
 """
 
-import os
 import sys
 import logging
 import argparse
 from datetime import datetime
 
-# 添加项目根目录到Python路径
-sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
-
-# 导入核心模块
+# 导入核心模块（直接运行脚本时其所在的项目根目录已在sys.path中）
 from core.config import config_manager
 from core.spider import crawl_all_data, crawl_hot_stocks, crawl_trader_data, crawl_stock_basic_info
 from core.data_manager import (
@@ -21,7 +17,9 @@ from core.data_manager import (
     insert_hot_stocks_data,
     insert_trader_data_data,
     get_hot_stocks_data,
-    get_trader_data_data
+    get_trader_data_data,
+    get_data_manager,
+    close_data_manager
 )
 
 # 获取日志记录器
@@ -158,22 +156,28 @@ def query_hot(date: str = None, limit: int = 100, detailed: bool = False) -> Non
             logger.info(f"查询到 {len(hot_stocks)} 条热门股数据")
             if detailed:
                 # 显示详细数据
-                logger.info("详细数据:")
+                lines = ["详细数据:"]
                 for stock in hot_stocks:
-                    logger.info(f"股票代码: {stock['stock_code']}")
-                    logger.info(f"股票名称: {stock['stock_name']}")
-                    logger.info(f"日期: {stock['date']}")
-                    logger.info(f"价格: {stock['price']}")
-                    logger.info(f"涨跌幅: {stock['change_percent']}%")
-                    logger.info(f"涨跌额: {stock['change_amount']}")
-                    logger.info(f"成交量: {stock['volume']}")
-                    logger.info(f"成交额: {stock['turnover']}")
-                    logger.info(f"排名: {stock['rank']}")
-                    logger.info("-" * 50)
+                    lines.extend([
+                        f"股票代码: {stock['stock_code']}",
+                        f"股票名称: {stock['stock_name']}",
+                        f"日期: {stock['date']}",
+                        f"价格: {stock['price']}",
+                        f"涨跌幅: {stock['change_percent']}%",
+                        f"涨跌额: {stock['change_amount']}",
+                        f"成交量: {stock['volume']}",
+                        f"成交额: {stock['turnover']}",
+                        f"排名: {stock['rank']}",
+                        "-" * 50,
+                    ])
             else:
                 # 显示简洁数据
-                for stock in hot_stocks:
-                    logger.info(f"{stock['stock_code']} {stock['stock_name']} - 价格: {stock['price']} 涨跌幅: {stock['change_percent']}% 成交量: {stock['volume']} 成交额: {stock['turnover']}")
+                lines = [
+                    f"{stock['stock_code']} {stock['stock_name']} - 价格: {stock['price']} 涨跌幅: {stock['change_percent']}% 成交量: {stock['volume']} 成交额: {stock['turnover']}"
+                    for stock in hot_stocks
+                ]
+            # 汇总后一次性输出，避免每行一次日志调用
+            logger.info("\n".join(lines))
         else:
             logger.warning("未查询到热门股数据")
             
@@ -193,8 +197,10 @@ def query_trader(trader_name: str = None, date: str = None) -> None:
         # 打印结果
         if trader_data:
             logger.info(f"查询到 {len(trader_data)} 条实盘选手交易数据")
-            for data in trader_data:
-                logger.info(f"{data['trader_name']} - {data['date']} {data['stock_code']} {data['stock_name']} {data['action']} - 价格: {data['price']} 数量: {data['volume']}")
+            logger.info("\n".join(
+                f"{data['trader_name']} - {data['date']} {data['stock_code']} {data['stock_name']} {data['action']} - 价格: {data['price']} 数量: {data['volume']}"
+                for data in trader_data
+            ))
         else:
             logger.warning("未查询到实盘选手交易数据")
             
@@ -241,6 +247,8 @@ def main() -> None:
         
         elif args.command == 'manage':
             if args.init_db:
+                # 数据管理器首次创建时建库建表
+                get_data_manager()
                 logger.info("数据库初始化完成")
             elif args.clear_old:
                 logger.info(f"清理 {args.clear_old} 天前的旧数据")
@@ -255,6 +263,9 @@ def main() -> None:
     except Exception as e:
         logger.error(f"程序执行失败: {e}")
         sys.exit(1)
+    finally:
+        # 关闭数据库连接
+        close_data_manager()
 
 
 if __name__ == "__main__":